@@ -14,26 +14,54 @@ Key features added:
 """
 
 import argparse
+import collections
+import functools
+import html
 import logging
+import mmap
 import os
 import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import List
 
-import requests
+import pandas as pd
+from lxml import html as lxml_html
 
-import bs4
-
-from .comparer import compare_tables, _table_to_df
+from . import __version__
+from .comparer import compare_frames, _table_to_df
 from .extractor import extract_testdetails
-from .html_report import generate_report, HTML_FOOTER, HTML_HEADER
-from .utils import is_url
+from .html_report import generate_report, next_chart_index, HTML_FOOTER, HTML_HEADER
+from .utils import SESSION, is_url
 
 # Threshold for auto-selecting files with significant module count
 MODULES_THRESHOLD = 15
 
+# Comparing one table pair costs about a millisecond of pandas work; below this
+# many pairs, starting a process pool costs more than it saves.
+PARALLEL_COMPARE_MIN_PAIRS = 256
+
+# Generating one single-column report takes a fraction of a second (parsing
+# the source HTML dominates); with fewer files than this, starting a process
+# pool costs more than it saves.
+PARALLEL_REPORT_MIN_FILES = 4
+
+# Directory listings fetched at once while crawling a remote report tree.
+# Crawling is bound by HTTP round trips, so threads are enough, and SESSION
+# keeps the connections to the report server alive between fetches.  When
+# several subdirectories are resolved at once they share this budget, so the
+# requests in flight never outnumber SESSION's pooled connections.
+REMOTE_CRAWL_WORKERS = 16
+
+# File name of the report looked for in every subdirectory
+_LEAF = "test_result_failures_suite.html"
+# Quoted href of an <a> tag in an autoindex listing; links with a query or
+# fragment (e.g. Apache's column-sort links) are never files or directories
+_HREF_RE = re.compile(rb"""<a\s[^>]*?href\s*=\s*["']([^"'?#]+)["']""", re.I)
+
 log = logging.getLogger(__name__)
 
 
@@ -51,36 +79,397 @@ def _extract_modules_total(tables: list) -> int:
     return 0
 
 
-def _sub_variants(name: str) -> list[str]:
-    """Return a list of possible name variants for a subdirectory.
+def _compare_pairs(
+    left_frames: list[pd.DataFrame], right_frames: list[pd.DataFrame]
+) -> tuple[list[pd.DataFrame], list[pd.DataFrame], list[pd.DataFrame]]:
+    """Compare the zipped DataFrame pairs; return ``(left_dfs, right_dfs, diffs)``.
+
+    The first two lists hold the aligned frames of each pair followed by the
+    unmatched extra frames of the longer side; ``diffs`` has one entry per
+    pair.  The tables are converted once by the caller (``_table_to_df``), so
+    the frames can also be sent to a process pool for large inputs.
+    """
+    pairs = min(len(left_frames), len(right_frames))
+    workers = min(os.cpu_count() or 1, pairs)
+    if pairs < PARALLEL_COMPARE_MIN_PAIRS or workers < 2:
+        results = list(map(compare_frames, left_frames, right_frames))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(compare_frames, left_frames, right_frames, chunksize=8)
+            )
+    left_dfs = [left_df for left_df, _, _ in results]
+    right_dfs = [right_df for _, right_df, _ in results]
+    diffs = [diff_df for _, _, diff_df in results]
+    # Preserve extra tables
+    left_dfs.extend(left_frames[pairs:])
+    right_dfs.extend(right_frames[pairs:])
+    return left_dfs, right_dfs, diffs
+
+
+def _find_html(root: str | os.PathLike) -> str | None:
+    """Return ``test_result_failures_suite.html`` under *root*, else the first ``*.html``.
+
+    Both lookups share one walk, in ``os.walk`` top-down order, which stops at
+    the first ``test_result_failures_suite.html``.  It runs directly on
+    ``os.scandir`` entries (no per-directory name lists, no ``Path`` objects).
+    """
+    first_html = None
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name == _LEAF:
+                return entry.path
+            elif first_html is None and entry.name.endswith(".html"):
+                first_html = entry.path
+        # Reversed so the first subdirectory is walked first
+        stack.extend(reversed(subdirs))
+    return first_html
+
+
+def _scandir_files(root: str | os.PathLike) -> list[str]:
+    """Return the report files under *root*, found in a single recursive walk.
+
+    These are the ``test_result_failures_suite.html`` files if there are any,
+    otherwise every ``*.html`` file.  Works on ``os.scandir`` entries, whose
+    cached type information saves the extra ``stat()`` per entry that
+    ``Path.rglob`` does; symlinked directories are not followed.
+    """
+    hits: list[str] = []
+    others: list[str] = []
+
+    def walk(path: str | os.PathLike) -> None:
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                walk(entry.path)
+            elif entry.name == _LEAF:
+                hits.append(entry.path)
+            elif not hits and entry.name.endswith(".html"):
+                others.append(entry.path)
+
+    walk(root)
+    return hits or others
+
+
+def _path_order(path: str) -> list[str]:
+    """Sort key giving strings the same order as the corresponding ``Path``s."""
+    return path.split(os.sep)
+
+
+# Called for every subdir by several lookups; the variants never change.
+@functools.lru_cache(maxsize=128)
+def _sub_variants(name: str) -> tuple[str, ...]:
+    """Return the possible name variants for a subdirectory, original first.
 
     Handles:
     * original case
     * lower / upper / title case
     * underscore present or absent (e.g., 'tv_ts' ↔ 'tvts')
+
+    A plain lower-case name such as the default ``cts`` or ``gts`` only gets
+    its case variants: trailing-underscore directories like ``cts_`` don't
+    occur, and each of those candidates costs a stat or an HTTP probe.
     """
-    variants: set[str] = {name, name.lower(), name.upper(), name.title()}
+    if name.islower() and "_" not in name:
+        return tuple(dict.fromkeys((name, name.upper(), name.title())))
     if "_" in name:
-        no_us = name.replace("_", "")
-        variants.update({no_us, no_us.lower(), no_us.upper(), no_us.title()})
+        alt = name.replace("_", "")
     else:
         # also try adding an underscore variant just in case
-        with_us = name + "_"
-        variants.update({with_us, with_us.lower(), with_us.upper(), with_us.title()})
-    # filter out empty strings
-    return [v for v in variants if v]
+        alt = name + "_"
+    # dict.fromkeys drops duplicates but, unlike a set, keeps the order stable;
+    # empty strings (name "_") are filtered out
+    return tuple(
+        v
+        for v in dict.fromkeys(
+            (name, name.lower(), name.upper(), name.title(),
+             alt, alt.lower(), alt.upper(), alt.title())
+        )
+        if v
+    )
+
+
+def _url_dir(url: str) -> str:
+    """Return *url* with a trailing slash, without copying it if it has one."""
+    return url if url.endswith("/") else url + "/"
+
 
 def _candidate(base: str, sub_name: str) -> str:
     """Return a URL or filesystem path for *sub_name* under *base*.
 
-    Handles both HTTP(S) URLs and local paths.
+    Handles both HTTP(S) URLs and local paths.  Callers building several
+    candidates under one URL pass it through ``_url_dir`` once beforehand.
     """
-    if base.startswith(("http://", "https://")):
-        return f"{base.rstrip('/')}/{sub_name}/"
+    if is_url(base):
+        return f"{_url_dir(base)}{sub_name}/"
     else:
         return str(Path(base) / sub_name)
 
 
+def _get_timestamp(source: str) -> float:
+    """Return POSIX timestamp for *source*.
+    For local files uses ``os.path.getmtime``; for URLs performs a HEAD request
+    and parses the ``Last-Modified`` header. Returns 0.0 on failure.
+    """
+    if is_url(source):
+        try:
+            resp = SESSION.head(source, timeout=5, allow_redirects=True)
+            if resp.status_code == 200:
+                lm = resp.headers.get("Last-Modified")
+                if lm:
+                    dt = parsedate_to_datetime(lm)
+                    return dt.timestamp()
+        except Exception:
+            pass
+        return 0.0
+    else:
+        try:
+            return os.path.getmtime(source)
+        except Exception:
+            return 0.0
+
+
+def _listing_exists(url: str) -> bool:
+    """Return True unless a HEAD request shows there is no listing at *url*.
+
+    Most name variants of a subdir don't exist; a bodiless HEAD answer rules
+    them out before any listing is downloaded and parsed.  Servers that don't
+    implement HEAD (405/501) are given the benefit of the doubt.
+    """
+    try:
+        resp = SESSION.head(url, timeout=5, allow_redirects=True)
+    except Exception as e:
+        log.debug(f"HEAD {url} failed: {e}")
+        return False
+    return resp.ok or resp.status_code in (405, 501)
+
+
+def _listing_hrefs(content: bytes) -> list[str]:
+    """Return the link targets of a directory listing page, in page order.
+
+    Apache/nginx "Index of" pages are regular enough for a regex scan over the
+    raw bytes; only when it finds nothing is the page parsed with lxml.
+    """
+    hrefs = [
+        m.decode("utf-8", errors="replace") for m in _HREF_RE.findall(content)
+    ]
+    if not hrefs:
+        return lxml_html.fromstring(content).xpath("//a/@href")
+    # Entities such as &amp; are rare in listings; only unescape when present
+    return [html.unescape(h) if "&" in h else h for h in hrefs]
+
+
+def _fetch_listing(url: str) -> list[tuple[bool, str]]:
+    """Return ``(is_report, full_url)`` for the links in the listing at *url*.
+
+    Only ``test_result_failures_suite.html`` links (``is_report`` True) and
+    sub-directory links (ending in ``/``) are returned, in page order; an
+    unreachable listing yields no links.
+    """
+    entries: list[tuple[bool, str]] = []
+    try:
+        # Streamed, so the headers can be checked before the body is fetched
+        with SESSION.get(url, timeout=10, stream=True) as resp:
+            resp.raise_for_status()
+            # A link ending in "/" may still serve a file; don't download it
+            content_type = resp.headers.get("Content-Type", "text/html")
+            if not content_type.lower().startswith("text/html"):
+                return entries
+            hrefs = _listing_hrefs(resp.content)
+        base = _url_dir(url)
+        for href in hrefs:
+            # Classify first, so ignored links never get a full URL built
+            if href.endswith(_LEAF):
+                is_report = True
+            elif href.endswith("/"):
+                is_report = False
+            else:
+                continue
+            full = href if href.startswith("http") else base + href.lstrip("/")
+            entries.append((is_report, full))
+    except Exception as e:
+        log.debug(f"Failed to collect files from {url}: {e}")
+    return entries
+
+
+def _collect_remote(
+    url: str, max_depth: int, probe: bool = True, workers: int = REMOTE_CRAWL_WORKERS
+) -> list[str]:
+    """Return ``test_result_failures_suite.html`` URLs found under the listing at *url*.
+
+    Sub-directory listings are followed up to *max_depth* levels below *url*.
+    The tree is crawled breadth-first and all listings of one level are
+    fetched concurrently by up to *workers* threads; results are in level
+    order, then page order.  Unless *probe* is False (the caller already checked), *url* is first
+    probed with ``_listing_exists``.
+    """
+    results: list[str] = []
+    if probe and not _listing_exists(url):
+        return results
+    # Only this thread touches visited; the workers just fetch and parse.
+    visited: set[str] = set()
+    level = [url]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for depth in range(max_depth + 1):
+            next_level: list[str] = []
+            for entries in pool.map(_fetch_listing, level):
+                for is_report, full in entries:
+                    if is_report:
+                        results.append(full)
+                    elif full not in visited:
+                        visited.add(full)
+                        next_level.append(full)
+            if not next_level:
+                break
+            level = next_level
+    return results
+
+
+def _select_best(paths: list[str]) -> str:
+    """Pick one report out of several candidates for the same subdirectory.
+
+    The newest report (by ``Last-Modified`` or mtime) whose Modules Total exceeds
+    ``MODULES_THRESHOLD`` wins; if there is none, the oldest one is used.
+    Candidates that cannot be extracted are left out of the ranking; if none
+    can be extracted, the first one is returned.
+    """
+    candidates = []
+    for path in paths:
+        try:
+            _, tables = extract_testdetails(path)
+        except Exception as e:
+            log.warning(f"Failed to get info for {path}: {e}")
+            continue
+        candidates.append((path, _get_timestamp(path), _extract_modules_total(tables)))
+    if not candidates:
+        log.warning(f"[Auto-select] No candidate could be read, using {paths[0]}")
+        return paths[0]
+
+    # Sort by timestamp descending
+    candidates.sort(key=lambda x: x[1], reverse=True)
+
+    # Select based on criteria: newer with Modules Total > threshold
+    for path, ts, modules_total in candidates:
+        if modules_total > MODULES_THRESHOLD:
+            log.info(
+                f"[Auto-select] Selected newer file with Modules Total > "
+                f"{MODULES_THRESHOLD}: {path} (modules={modules_total})"
+            )
+            return path
+
+    # No file with Modules Total > threshold, select the oldest
+    selected = candidates[-1][0]
+    log.info(
+        f"[Auto-select] No file with Modules Total > {MODULES_THRESHOLD}, "
+        f"selected oldest: {selected}"
+    )
+    return selected
+
+
+def _resolve_with_all_variants(
+    base: str, sub_name: str, workers: int = REMOTE_CRAWL_WORKERS
+) -> str:
+    """Try all case/underscore variants of *sub_name*.
+
+    If multiple HTML files are found under a subdir, select the best one based on:
+    - For remote: timestamp and Modules Total
+    - For local: mtime and Modules Total
+
+    Usually only one variant exists, so the variants are first probed cheaply
+    (a HEAD request or an ``is_dir`` check) and only the first existing one
+    is searched.
+
+    Returns the selected HTML path, or empty string if not found.
+    """
+    html_files: list[str] = []
+    if is_url(base):
+        base = _url_dir(base)
+    candidates = [_candidate(base, variant) for variant in _sub_variants(sub_name)]
+    if is_url(base):
+        # Remote URL - probe all variants at once (most of them simply 404),
+        # then collect report files in the first existing one and one level below
+        with ThreadPoolExecutor(max_workers=min(len(candidates), workers)) as pool:
+            exists = list(pool.map(_listing_exists, candidates))
+        cand = next((c for c, ok in zip(candidates, exists) if ok), None)
+        if cand is not None:
+            html_files = _collect_remote(cand, max_depth=1, probe=False, workers=workers)
+    else:
+        # Local path - collect all HTML files in the first existing variant
+        cand = next((c for c in candidates if os.path.isdir(c)), None)
+        if cand is not None:
+            html_files = _scandir_files(cand)
+
+    if not html_files:
+        return ""
+    if len(html_files) == 1:
+        return html_files[0]
+    return _select_best(html_files)
+
+
+def _generate_one(
+    sub: str, idx: int, left_path: str, temp_dir: Path, chart_index: int
+) -> Path:
+    """Write the single-column report for part *idx* of *sub* and return its path.
+
+    Module-level so that it can run in a worker process.
+    """
+    log.debug(f"Processing {left_path} for sub '{sub}' (part {idx})")
+    left_title, left_tables = extract_testdetails(left_path)
+    left_dfs = [_table_to_df(t) for t in left_tables]
+    has_testdetails = any("testdetails" in (t.get("class") or []) for t in left_tables)
+    out_path = temp_dir / f"{sub}_{idx}.html"
+    generate_report(
+        left_dfs,
+        [],
+        [],
+        left_title or f"{sub} – part {idx}",
+        "",
+        out_path,
+        left_path,
+        None,
+        has_testdetails=has_testdetails,
+        chart_index=chart_index,
+    )
+    return out_path
+
+
+def _generate_reports(tasks: list[tuple[str, int, str]], temp_dir: Path) -> list[Path]:
+    """Run ``_generate_one`` for each ``(sub, idx, left_path)`` in *tasks*, in order.
+
+    Each report is independent and CPU-bound, so larger batches are spread
+    over a process pool.  Chart indices are drawn here, in task order, so the
+    chart ids match a sequential run and stay unique across workers.
+    """
+    chart_indices = [next_chart_index() for _ in tasks]
+    args = (
+        [sub for sub, _, _ in tasks],
+        [idx for _, idx, _ in tasks],
+        [path for _, _, path in tasks],
+        [temp_dir] * len(tasks),
+        chart_indices,
+    )
+    workers = min(os.cpu_count() or 1, len(tasks))
+    if len(tasks) < PARALLEL_REPORT_MIN_FILES or workers < 2:
+        return list(map(_generate_one, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_generate_one, *args))
+
+
 def _process_remote(left_url: str, subdirs: list[str], temp_dir: Path, select_best: bool = True) -> list[Path]:
     """Process remote HTTP directory.
 
@@ -89,43 +478,22 @@ def _process_remote(left_url: str, subdirs: list[str], temp_dir: Path, select_be
 
     Returns a list of generated report file paths.
     """
-    generated: list[Path] = []
-    base_url = left_url.rstrip("/") + "/"
+    tasks: list[tuple[str, int, str]] = []
+    base_url = _url_dir(left_url)
     for sub in subdirs:
-        # Generate all case/underscore variants for the subdirectory name
-        sub_variants = _sub_variants(sub)
+        # Probe all case/underscore variants of the subdirectory name at once
+        # (most of them simply 404), then crawl the existing ones in variant
+        # order until one has reports.  Case-insensitive servers answer for
+        # every variant, so only one tree is ever crawled.
+        sub_urls = [f"{base_url}{v}/" for v in _sub_variants(sub)]
+        with ThreadPoolExecutor(max_workers=len(sub_urls)) as pool:
+            exists = list(pool.map(_listing_exists, sub_urls))
         html_files: list[str] = []
-        for sub_variant in sub_variants:
-            sub_url = f"{base_url}{sub_variant}/"
-            visited: set[str] = set()
-
-            def _collect(url: str, depth: int = 0) -> list[str]:
-                if depth > 5:
-                    return []
-                results: list[str] = []
-                try:
-                    resp = requests.get(url, timeout=10)
-                    resp.raise_for_status()
-                    soup = bs4.BeautifulSoup(resp.text, "html.parser")
-                    for a in soup.find_all("a", href=True):
-                        href = a["href"]
-                        full = (
-                            href
-                            if href.startswith("http")
-                            else url.rstrip("/") + "/" + href.lstrip("/")
-                        )
-                        if href.endswith("test_result_failures_suite.html"):
-                            results.append(full)
-                        elif href.endswith("/") and full not in visited:
-                            visited.add(full)
-                            results.extend(_collect(full, depth + 1))
-                except Exception:
-                    pass
-                return results
-
-            html_files = sorted(set(_collect(sub_url)))
-            if html_files:
-                break
+        for sub_url, ok in zip(sub_urls, exists):
+            if ok:
+                html_files = sorted(set(_collect_remote(sub_url, max_depth=5, probe=False)))
+                if html_files:
+                    break
         if not html_files:
             log.info(
                 f"No 'test_result_failures_suite.html' found under remote sub '{sub}'."
@@ -134,68 +502,12 @@ def _process_remote(left_url: str, subdirs: list[str], temp_dir: Path, select_be
 
         # If multiple files and select_best is True, choose the best one
         if len(html_files) > 1 and select_best:
-            # Get timestamp and Modules Total for each file
-            candidates = []
-            for html_file in html_files:
-                try:
-                    # Get timestamp
-                    resp = requests.head(html_file, timeout=10, allow_redirects=True)
-                    if resp.status_code == 200:
-                        lm = resp.headers.get("Last-Modified")
-                        ts = parsedate_to_datetime(lm).timestamp() if lm else 0
-                    else:
-                        ts = 0
-                    # Get Modules Total from the file
-                    title, tables = extract_testdetails(html_file)
-                    modules_total = _extract_modules_total(tables)
-                    candidates.append((html_file, ts, modules_total))
-                except Exception as e:
-                    log.warning(f"Failed to get info for {html_file}: {e}")
-                    candidates.append((html_file, 0, 0))
-
-            # Sort by timestamp descending
-            candidates.sort(key=lambda x: x[1], reverse=True)
-
-            # Select based on criteria: newer with Modules Total > threshold
-            selected = None
-            for html_file, ts, modules_total in candidates:
-                if modules_total > MODULES_THRESHOLD:
-                    selected = html_file
-                    log.info(
-                        f"[Auto-select] Selected newer file with Modules Total > "
-                        f"{MODULES_THRESHOLD}: {html_file} (modules={modules_total})"
-                    )
-                    break
-            if selected is None:
-                # No file with Modules Total > threshold, select the oldest
-                selected = candidates[-1][0] if candidates else html_files[0]
-                log.info(
-                    f"[Auto-select] No file with Modules Total > {MODULES_THRESHOLD}, "
-                    f"selected oldest: {selected}"
-                )
-            html_files = [selected]
+            html_files = [_select_best(html_files)]
         elif len(html_files) > 1:
             log.info(f"Multiple files found for '{sub}', using all: {len(html_files)} files")
 
-        for idx, left_path in enumerate(html_files, start=1):
-            log.debug(f"Processing remote {left_path} for sub '{sub}' (part {idx})")
-            left_title, left_tables = extract_testdetails(left_path)
-            left_dfs = [_table_to_df(t) for t in left_tables]
-            has_testdetails = any("testdetails" in (t.get("class") or []) for t in left_tables)
-            out_path = temp_dir / f"{sub}_{idx}.html"
-            generate_report(
-                left_dfs,
-                [],
-                [],
-                left_title or f"{sub} – part {idx}",
-                "",
-                out_path,
-                left_path,
-                None,
-                has_testdetails=has_testdetails,
-            )
-            generated.append(out_path)
-    return generated
+        tasks.extend((sub, idx, path) for idx, path in enumerate(html_files, start=1))
+    return _generate_reports(tasks, temp_dir)
 
 
 def _process_local(left_root: str, subdirs: list[str], temp_dir: Path, select_best: bool = True) -> list[Path]:
@@ -206,7 +518,7 @@ def _process_local(left_root: str, subdirs: list[str], temp_dir: Path, select_be
 
     Returns a list of generated report file paths.
     """
-    generated: list[Path] = []
+    tasks: list[tuple[str, int, str]] = []
     root_dir = Path(left_root)
     for sub in subdirs:
         # Generate all case/underscore variants for the subdirectory name
@@ -220,76 +532,22 @@ def _process_local(left_root: str, subdirs: list[str], temp_dir: Path, select_be
         if sub_dir_path is None:
             log.info(f"Subdirectory '{sub}' not found (tried variants) under {root_dir}, skipping.")
             continue
-        html_files = sorted(sub_dir_path.rglob("test_result_failures_suite.html"))
+        # falls back to any html file if the specific suite is not found
+        html_files = sorted(_scandir_files(sub_dir_path), key=_path_order)
         if not html_files:
-            # fallback to any html file if specific suite not found
-            html_files = sorted(sub_dir_path.rglob("*.html"))
-            if not html_files:
-                log.info(
-                    f"No HTML files found under {sub_dir_path}, skipping."
-                )
-                continue
+            log.info(
+                f"No HTML files found under {sub_dir_path}, skipping."
+            )
+            continue
 
         # If multiple files and select_best is True, choose the best one
         if len(html_files) > 1 and select_best:
-            # Get timestamp and Modules Total for each file
-            html_candidates = []
-            for html_path in html_files:
-                try:
-                    # Get timestamp (mtime)
-                    ts = html_path.stat().st_mtime
-                    # Get Modules Total from the file
-                    _, left_tables = extract_testdetails(str(html_path))
-                    modules_total = _extract_modules_total(left_tables)
-                    html_candidates.append((str(html_path), ts, modules_total))
-                except Exception as e:
-                    log.warning(f"Failed to get info for {html_path}: {e}")
-                    html_candidates.append((str(html_path), 0, 0))
-
-            # Sort by timestamp descending
-            html_candidates.sort(key=lambda x: x[1], reverse=True)
-
-            # Select based on criteria: newer with Modules Total > threshold
-            selected = None
-            for html_path, ts, modules_total in html_candidates:
-                if modules_total > MODULES_THRESHOLD:
-                    selected = html_path
-                    log.info(
-                        f"[Auto-select] Selected newer file with Modules Total > "
-                        f"{MODULES_THRESHOLD}: {html_path} (modules={modules_total})"
-                    )
-                    break
-            if selected is None:
-                # No file with Modules Total > threshold, select the oldest
-                selected = html_candidates[-1][0] if html_candidates else str(html_files[0])
-                log.info(
-                    f"[Auto-select] No file with Modules Total > {MODULES_THRESHOLD}, "
-                    f"selected oldest: {selected}"
-                )
-            html_files = [Path(selected)]
+            html_files = [_select_best(html_files)]
         elif len(html_files) > 1:
             log.info(f"Multiple files found for '{sub}', using all: {len(html_files)} files")
 
-        for idx, html_path in enumerate(html_files, start=1):
-            left_path = str(html_path)
-            log.debug(f"Processing {left_path} for sub '{sub}' (part {idx})")
-            left_title, left_tables = extract_testdetails(left_path)
-            left_dfs = [_table_to_df(t) for t in left_tables]
-            has_testdetails = any("testdetails" in (t.get("class") or []) for t in left_tables)
-            out_path = temp_dir / f"{sub}_{idx}.html"
-            generate_report(
-                left_dfs,
-                [],
-                [],
-                left_title or f"{sub} – part {idx}",
-                "",
-                out_path,
-                left_path,
-                None,
-                has_testdetails=has_testdetails,
-            )
-            generated.append(out_path)
-    return generated
+        tasks.extend((sub, idx, path) for idx, path in enumerate(html_files, start=1))
+    return _generate_reports(tasks, temp_dir)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -343,7 +601,6 @@ def build_parser() -> argparse.ArgumentParser:
     )
 
     # ----- version flag -----
-    from . import __version__
     parser.add_argument(
         "-V",
         "--version",
@@ -394,16 +651,14 @@ def main(argv: List[str] | None = None) -> None:
         if not is_url(args.left):
             log.error("--interactive 只能在提供远程 URL 作为左路径时使用。")
             sys.exit(1)
-        base_url = args.left  # 保存原始根 URL 供后续构造子目录路径
+        base_url = _url_dir(args.left)  # 保存原始根 URL 供后续构造子目录路径
         # Fetch subdirectory list from remote URL
         def _list_remote_subdirs(base: str) -> list[str]:
             try:
-                resp = requests.get(base, timeout=10)
+                resp = SESSION.get(base, timeout=10)
                 resp.raise_for_status()
-                soup = bs4.BeautifulSoup(resp.text, "html.parser")
                 subs: list[str] = []
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
+                for href in _listing_hrefs(resp.content):
                     # consider only directories (ending with '/') and ignore parent links
                     if href.endswith("/") and href not in ("../", "./"):
                         name = href.rstrip("/")
@@ -425,17 +680,19 @@ def main(argv: List[str] | None = None) -> None:
               "  - 输入两个编号,用逗号分隔 → 生成两目录里XTS的对比报告\n"
         "编号: "
         )
-        chosen_idxs = [s.strip() for s in sel.split(',') if s.strip().isdigit()]
+        # Parse and de-duplicate in one pass; a dict keeps the typed order,
+        # which decides the left/right sides
+        chosen_idxs = list(
+            dict.fromkeys(int(s) for s in sel.split(",") if s.strip().isdigit())
+        )
         if not chosen_idxs:
             log.error("未选择有效的目录编号")
             sys.exit(1)
-        chosen = []
-        for ci in chosen_idxs:
-            i = int(ci) - 1
-            if i < 0 or i >= len(remote_subs):
-                log.error("选择的编号超出范围: %s", ci)
-                sys.exit(1)
-            chosen.append(remote_subs[i])
+        invalid = [i for i in chosen_idxs if not 1 <= i <= len(remote_subs)]
+        if invalid:
+            log.error("选择的编号超出范围: %s", ", ".join(map(str, invalid)))
+            sys.exit(1)
+        chosen = [remote_subs[i - 1] for i in chosen_idxs]
         if len(chosen) == 1:
             args.left = _candidate(base_url, chosen[0])
             args.right = ""
@@ -465,60 +722,58 @@ def main(argv: List[str] | None = None) -> None:
           inside the directory *or* inside the provided ``subdir`` (if any). If not found,
           fall back to the first ``*.html`` file.
         """
-        if arg.startswith(("http://", "https://")):
+        if is_url(arg):
             # URL handling – if it ends with a slash treat it as a directory
             if arg.endswith("/"):
 
-                def _search(url, depth=0):
-                    if depth > 3:
-                        return None
-                    # Try conventional file name first
-                    cand = url.rstrip("/") + "/test_result_failures_suite.html"
-                    try:
-                        resp = requests.head(cand, timeout=10)
-                        if resp.status_code == 200:
-                            return cand
-                    except Exception:
-                        pass
-                    # Fetch directory listing and look for .html links
-                    try:
-                        resp = requests.get(url, timeout=10)
-                        resp.raise_for_status()
-                        soup = bs4.BeautifulSoup(resp.text, "html.parser")
-                        for a in soup.find_all("a", href=True):
-                            href = a["href"]
-                            if href.lower().endswith(".html"):
-                                full_url = (
-                                    href
-                                    if href.startswith("http")
-                                    else url.rstrip("/") + "/" + href.lstrip("/")
-                                )
-                                try:
-                                    page_resp = requests.get(full_url, timeout=10)
-                                    if page_resp.ok and "testdetails" in page_resp.text:
-                                        return full_url
-                                except Exception:
+                def _search(root_url):
+                    # Breadth-first over a queue with a seen-set, so each directory
+                    # is probed and listed once and the shallowest report wins.
+                    queue = collections.deque([(root_url, 0)])
+                    visited: set[str] = set()
+                    while queue:
+                        url, depth = queue.popleft()
+                        base = _url_dir(url)
+                        if depth > 3 or base in visited:
+                            continue
+                        visited.add(base)
+                        # Try conventional file name first
+                        cand = base + _LEAF
+                        try:
+                            resp = SESSION.head(cand, timeout=10)
+                            if resp.status_code in (405, 501):
+                                # Server refuses HEAD – confirm with a GET, reading headers only
+                                with SESSION.get(cand, timeout=10, stream=True) as resp:
                                     pass
-                                # fallback to first html link
-                                if href.startswith("http"):
-                                    return href
-                                else:
-                                    base = url.rstrip("/") + "/"
+                            if resp.status_code == 200:
+                                return cand
+                        except Exception:
+                            pass
+                        # Fetch directory listing and look for .html links
+                        try:
+                            resp = SESSION.get(base, timeout=10)
+                            resp.raise_for_status()
+                            hrefs = _listing_hrefs(resp.content)
+                            for href in hrefs:
+                                # Lower-case just the suffix, not the whole href
+                                if href[-5:].lower() == ".html":
+                                    # The first html link is used whether or not its body
+                                    # mentions ``testdetails``, so don't download it here.
+                                    if href.startswith("http"):
+                                        return href
                                     return base + href.lstrip("/")
-                        # recurse into sub‑directories
-                        for a in soup.find_all("a", href=True):
-                            href = a["href"]
-                            if href.endswith("/"):
-                                sub_url = (
-                                    href
-                                    if href.startswith("http")
-                                    else url.rstrip("/") + "/" + href.lstrip("/")
+                            # Queue sub-directories in page order
+                            queue.extend(
+                                (
+                                    href if href.startswith("http")
+                                    else base + href.lstrip("/"),
+                                    depth + 1,
                                 )
-                                found = _search(sub_url, depth + 1)
-                                if found:
-                                    return found
-                    except Exception:
-                        pass
+                                for href in hrefs
+                                if href.endswith("/")
+                            )
+                        except Exception:
+                            pass
                     return None
 
                 found_url = _search(arg)
@@ -529,45 +784,18 @@ def main(argv: List[str] | None = None) -> None:
         if p.is_dir():
             # If a subdir name is provided (dual‑column mode), look inside it
             search_root = p / subdir if subdir else p
-            # Prefer the conventional file name
-            for file in search_root.rglob("test_result_failures_suite.html"):
-                if file.is_file():
-                    return str(file)
-            # Fallback: first *.html file under the root
-            for file in search_root.rglob("*.html"):
-                if file.is_file():
-                    return str(file)
+            found = _find_html(search_root)
+            if found:
+                return found
         return arg
 
     # ----- Multi‑subdir processing -----
 
     # Determine mode and initial subdirectory list
-    def _get_timestamp(source: str) -> float:
-        """Return POSIX timestamp for *source*.
-        For local files uses ``os.path.getmtime``; for URLs performs a HEAD request
-        and parses the ``Last-Modified`` header. Returns 0.0 on failure.
-        """
-        if source.startswith(("http://", "https://")):
-            try:
-                resp = requests.head(source, timeout=5, allow_redirects=True)
-                if resp.status_code == 200:
-                    lm = resp.headers.get("Last-Modified")
-                    if lm:
-                        dt = parsedate_to_datetime(lm)
-                        return dt.timestamp()
-            except Exception:
-                pass
-            return 0.0
-        else:
-            try:
-                return os.path.getmtime(source)
-            except Exception:
-                return 0.0
     single_mode = not args.right
     subdirs = [s.strip() for s in args.subdirs.split(",") if s.strip()]
     temp_dir = Path.cwd() / "tmp_diff_reports"
     # 每次运行前清空临时报告目录，防止旧文件干扰
-    import shutil
     if temp_dir.exists():
         shutil.rmtree(temp_dir)
     temp_dir.mkdir(parents=True, exist_ok=True)
@@ -584,18 +812,9 @@ def main(argv: List[str] | None = None) -> None:
         left_dfs = [_table_to_df(t) for t in left_tables]
         if right_path:
             right_title, right_tables = extract_testdetails(right_path)
-            right_dfs = [_table_to_df(t) for t in right_tables]
-            diffs = []
-            for lt, rt in zip(left_tables, right_tables):
-                ldf, rdf, diffdf = compare_tables(lt, rt)
-                left_dfs.append(ldf)
-                right_dfs.append(rdf)
-                diffs.append(diffdf)
-            # Preserve extra tables
-            if len(left_tables) > len(right_tables):
-                left_dfs.extend(_table_to_df(t) for t in left_tables[len(right_tables):])
-            elif len(right_tables) > len(left_tables):
-                right_dfs.extend(_table_to_df(t) for t in right_tables[len(left_tables):])
+            left_dfs, right_dfs, diffs = _compare_pairs(
+                left_dfs, [_table_to_df(t) for t in right_tables]
+            )
             out_path = temp_dir / f"{sub_name}-diff.html"
             has_testdetails = any("testdetails" in (t.get("class") or []) for t in left_tables) or \
                               any("testdetails" in (t.get("class") or []) for t in right_tables)
@@ -642,112 +861,13 @@ def main(argv: List[str] | None = None) -> None:
             generated_files.extend(_process_local(args.left, subdirs, temp_dir, select_best=False))
         # After processing all subdirs, skip the normal per‑subdir loop for single‑column mode
         subdirs = []
-    # Continue with the original loop (may be empty)
-    for sub in subdirs:
-        # Resolve left/right paths for this subdirectory
-        # Build candidate URLs/paths for the subdirectory, handling case and underscore variants.
-
-        def _resolve_with_all_variants(base: str, sub_name: str) -> str:
-            """Try all case/underscore variants of *sub_name*.
-
-            If multiple HTML files are found under a subdir, select the best one based on:
-            - For remote: timestamp and Modules Total
-            - For local: mtime and Modules Total
-
-            Returns the selected HTML path, or empty string if not found.
-            """
-            candidates = []
-            for variant in _sub_variants(sub_name):
-                cand = _candidate(base, variant)
-
-                if is_url(str(cand)):
-                    # Remote URL - collect all HTML files
-                    try:
-                        resp = requests.get(str(cand).rstrip("/") + "/", timeout=10)
-                        resp.raise_for_status()
-                        soup = bs4.BeautifulSoup(resp.text, "html.parser")
-                        html_files = []
-                        for a in soup.find_all("a", href=True):
-                            href = a["href"]
-                            if href.endswith("test_result_failures_suite.html"):
-                                full = href if href.startswith("http") else str(cand).rstrip("/") + "/" + href.lstrip("/")
-                                html_files.append(full)
-                            elif href.endswith("/"):
-                                # Recursively collect from subdirectories
-                                sub_url = href if href.startswith("http") else str(cand).rstrip("/") + "/" + href.lstrip("/")
-                                try:
-                                    sub_resp = requests.get(sub_url, timeout=10)
-                                    sub_resp.raise_for_status()
-                                    sub_soup = bs4.BeautifulSoup(sub_resp.text, "html.parser")
-                                    for sub_a in sub_soup.find_all("a", href=True):
-                                        sub_href = sub_a["href"]
-                                        if sub_href.endswith("test_result_failures_suite.html"):
-                                            sub_full = sub_href if sub_href.startswith("http") else sub_url.rstrip("/") + "/" + sub_href.lstrip("/")
-                                            html_files.append(sub_full)
-                                except:
-                                    pass
-                        # Get timestamp and Modules Total for each file
-                        for html_file in html_files:
-                            try:
-                                # Get timestamp
-                                head_resp = requests.head(html_file, timeout=10, allow_redirects=True)
-                                ts = (
-                                    parsedate_to_datetime(head_resp.headers["Last-Modified"]).timestamp()
-                                    if head_resp.status_code == 200 and head_resp.headers.get("Last-Modified")
-                                    else 0
-                                )
-                                # Get Modules Total
-                                _, tables = extract_testdetails(html_file)
-                                modules_total = _extract_modules_total(tables)
-                                candidates.append((html_file, ts, modules_total))
-                            except:
-                                pass
-                    except Exception as e:
-                        log.debug(f"Failed to collect files from {cand}: {e}")
-                else:
-                    # Local path - collect all HTML files
-                    p = Path(str(cand))
-                    if p.is_dir():
-                        html_files = list(p.rglob("test_result_failures_suite.html"))
-                        if not html_files:
-                            html_files = list(p.rglob("*.html"))
-                        for html_path in html_files:
-                            try:
-                                ts = html_path.stat().st_mtime
-                                _, tables = extract_testdetails(str(html_path))
-                                modules_total = _extract_modules_total(tables)
-                                candidates.append((str(html_path), ts, modules_total))
-                            except:
-                                pass
-
-            if not candidates:
-                return ""
-
-            # Select best file based on criteria
-            if len(candidates) == 1:
-                return candidates[0][0]
-
-            # Sort by timestamp descending
-            candidates.sort(key=lambda x: x[1], reverse=True)
-
-            # Select: newer with Modules Total > threshold
-            for html_path, ts, modules_total in candidates:
-                if modules_total > MODULES_THRESHOLD:
-                    log.info(
-                        f"[Auto-select] Selected {html_path} (modules={modules_total})"
-                    )
-                    return html_path
-
-            # No file with Modules Total > threshold, select the oldest
-            selected = candidates[-1][0]
-            log.info(
-                f"[Auto-select] No file with Modules Total > {MODULES_THRESHOLD}, "
-                f"selected oldest: {selected}"
-            )
-            return selected
 
-        left_path = _resolve_with_all_variants(args.left, sub)
-        right_path = _resolve_with_all_variants(args.right, sub) if args.right else ""
+    def _fetch_subdir(sub: str) -> tuple:
+        """Resolve and extract the left/right reports for one subdirectory."""
+        left_path = _resolve_with_all_variants(args.left, sub, crawl_workers)
+        right_path = (
+            _resolve_with_all_variants(args.right, sub, crawl_workers) if args.right else ""
+        )
         # Determine newer side based on timestamps
         if args.right:
             left_ts = _get_timestamp(left_path)
@@ -765,6 +885,38 @@ def main(argv: List[str] | None = None) -> None:
             right_title, right_tables = extract_testdetails(right_path)
         else:
             right_title, right_tables = "", []
+        return (
+            left_path,
+            right_path,
+            newer_side,
+            left_title,
+            left_tables,
+            right_title,
+            right_tables,
+        )
+
+    # Resolving a subdir is dominated by HTTP round-trips (listings, HEAD probes,
+    # report downloads), so fetch all subdirs concurrently.  Comparison and
+    # report generation stay serial to keep the merged output deterministic.
+    # Threads rather than processes: the extracted bs4 tables cannot be pickled
+    # back to the parent (deep trees hit the recursion limit).  The subdirs
+    # share REMOTE_CRAWL_WORKERS, so nested crawls stay within SESSION's pool.
+    fetched = []
+    if subdirs:
+        fetch_workers = min(len(subdirs), REMOTE_CRAWL_WORKERS)
+        crawl_workers = max(1, REMOTE_CRAWL_WORKERS // fetch_workers)
+        with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+            fetched = list(pool.map(_fetch_subdir, subdirs))
+    # Continue with the original loop (may be empty)
+    for sub, (
+        left_path,
+        right_path,
+        newer_side,
+        left_title,
+        left_tables,
+        right_title,
+        right_tables,
+    ) in zip(subdirs, fetched):
         # Separate tables by class type for proper matching
         left_testdetails = [t for t in left_tables if "testdetails" in (t.get("class") or [])]
         left_incomplete = [t for t in left_tables if "incompletemodules" in (t.get("class") or [])]
@@ -778,29 +930,18 @@ def main(argv: List[str] | None = None) -> None:
         elif not left_testdetails or not right_testdetails:
             # One side missing testdetails – still generate report with whatever tables are present.
             log.info(f"Partial testdetails for subdir '{sub}'.")
-        left_dfs, right_dfs, diffs = [], [], []
-        # Compare testdetails tables first
-        for lt, rt in zip(left_testdetails, right_testdetails):
-            left_df, right_df, diff_df = compare_tables(lt, rt)
-            left_dfs.append(left_df)
-            right_dfs.append(right_df)
-            diffs.append(diff_df)
-        # Preserve extra testdetails tables
-        if len(left_testdetails) > len(right_testdetails):
-            left_dfs.extend(_table_to_df(t) for t in left_testdetails[len(right_testdetails):])
-        elif len(right_testdetails) > len(left_testdetails):
-            right_dfs.extend(_table_to_df(t) for t in right_testdetails[len(left_testdetails):])
+        # Compare testdetails tables first; each table is converted exactly once
+        left_dfs, right_dfs, diffs = _compare_pairs(
+            [_table_to_df(t) for t in left_testdetails],
+            [_table_to_df(t) for t in right_testdetails],
+        )
         # Now handle incompletemodules tables (they are displayed differently)
-        for lt, rt in zip(left_incomplete, right_incomplete):
-            left_df, right_df, diff_df = compare_tables(lt, rt)
-            left_dfs.append(left_df)
-            right_dfs.append(right_df)
-            diffs.append(diff_df)
-        # Preserve extra incompletemodules tables
-        if len(left_incomplete) > len(right_incomplete):
-            left_dfs.extend(_table_to_df(t) for t in left_incomplete[len(right_incomplete):])
-        elif len(right_incomplete) > len(left_incomplete):
-            right_dfs.extend(_table_to_df(t) for t in right_incomplete[len(left_incomplete):])
+        incomplete_results = _compare_pairs(
+            [_table_to_df(t) for t in left_incomplete],
+            [_table_to_df(t) for t in right_incomplete],
+        )
+        for dfs, more in zip((left_dfs, right_dfs, diffs), incomplete_results):
+            dfs.extend(more)
         out_path = temp_dir / f"{sub}-diff.html"
         has_testdetails = bool(left_testdetails) or bool(right_testdetails)
         generate_report(
@@ -835,36 +976,39 @@ def main(argv: List[str] | None = None) -> None:
         other_files = generated_files[1:]
 
     # Merge reports by stacking each report's own <div class='container'> block vertically.
-    # Remove the common HTML_HEADER and HTML_FOOTER from each generated report, keeping the inner container.
-    def extract_container(html: str) -> str:
-        """Return the <div class='container'>...</div> block of a report."""
-        # Strip the shared header/footer; the remainder starts with the container div.
-        return html.replace(HTML_HEADER, "").replace(HTML_FOOTER, "").strip()
-
     # Header without the opening <div class='container'> (we will keep each report's own container)
     header_no_container = HTML_HEADER.split("<div class='container'>")[0]
     # Footer that only closes body and html (no extra </div>)
     footer_snippet = "</body></html>"
-
-    # Concatenate full container blocks from each generated report
-    combined_body = ""
-    for file in generated_files:
-        # Remove the shared HTML_HEADER and HTML_FOOTER, but keep the <div class='container'> wrapper
-        content = file.read_text(encoding="utf-8")
-        # Strip the outer header up to the container start (inclusive), then keep from there
-        # Find the first occurrence of "<div class='container'>"
-        start = content.find("<div class='container'>")
-        end = content.rfind(HTML_FOOTER)
-        if start != -1 and end != -1:
-            combined_body += content[start:end]
-        else:
-            # Fallback: use whole content (unlikely)
-            combined_body += content
-    final_html = header_no_container + combined_body + footer_snippet
+    # The reports are UTF-8 and the markers are ASCII, so the blocks can be cut
+    # out of the raw bytes without decoding and re-encoding each report.
+    container_token = b"<div class='container'>"
+    footer_token = HTML_FOOTER.encode("utf-8")
 
     final_path = Path(args.output)
     final_path.parent.mkdir(parents=True, exist_ok=True)
-    final_path.write_text(final_html, encoding="utf-8")
+    # Stream each report's container block straight to the output instead of
+    # growing one combined string.
+    with final_path.open("wb") as out:
+        out.write(header_no_container.encode("utf-8"))
+        for file in generated_files:
+            with file.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    # mmap cannot map an empty file, and there is nothing to copy
+                    continue
+                # Search the mapped file and write the kept block straight from the
+                # mapping, so no report is ever copied into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    # Keep from the first container div up to the shared HTML_FOOTER
+                    start = content.find(container_token)
+                    end = content.rfind(footer_token)
+                    if start != -1 and end != -1:
+                        with memoryview(content) as view:
+                            out.write(view[start:end])
+                    else:
+                        # Fallback: use whole content (unlikely)
+                        out.write(content)
+        out.write(footer_snippet.encode("utf-8"))
     log.info("Merged diff report written to %s", final_path)
     return
 
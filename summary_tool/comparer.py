@@ -1,4 +1,5 @@
-﻿import pandas as pd
+﻿import numpy as np
+import pandas as pd
 import logging
 from bs4 import Tag
 from typing import Tuple
@@ -26,21 +27,40 @@ def _table_to_df(table: Tag) -> pd.DataFrame:
         return pd.DataFrame(rows, columns=col_names)
 
 
-def compare_tables(
-    left_tbl: Tag, right_tbl: Tag
+def _diff_aligned(left_df: pd.DataFrame, right_df: pd.DataFrame) -> pd.DataFrame:
+    """Equivalent of ``left_df.compare(right_df, keep_equal=False)`` for aligned frames.
+
+    ``DataFrame.compare`` carries milliseconds of fixed overhead even for the
+    handful of cells in a testdetails table, so the cell comparison is done as
+    a single NumPy operation and the result frame is assembled directly.
+    """
+    left_vals = left_df.to_numpy(dtype=object)
+    right_vals = right_df.to_numpy(dtype=object)
+    # Cells that differ; two missing values count as equal, as in ``compare``
+    changed = (left_vals != right_vals) & ~(pd.isna(left_vals) & pd.isna(right_vals))
+    rows = changed.any(axis=1)
+    cols = changed.any(axis=0)
+    mask = changed[rows][:, cols]
+    data = np.empty((mask.shape[0], 2 * mask.shape[1]), dtype=object)
+    data[:, 0::2] = np.where(mask, left_vals[rows][:, cols], np.nan)
+    data[:, 1::2] = np.where(mask, right_vals[rows][:, cols], np.nan)
+    columns = pd.MultiIndex.from_product([left_df.columns[cols], ["self", "other"]])
+    return pd.DataFrame(data, index=left_df.index[rows], columns=columns)
+
+
+def compare_frames(
+    left_df: pd.DataFrame, right_df: pd.DataFrame
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Return left_df, right_df, diff_df highlighting cell differences.
+    """Return left_df, right_df, diff_df for two already converted tables.
     Align both index and columns (outer join) before calling ``DataFrame.compare``
     so pandas can operate on identically‑labeled frames.
     """
     try:
-        left_df = _table_to_df(left_tbl)
-        right_df = _table_to_df(right_tbl)
         # Align rows and columns together
         left_df, right_df = left_df.align(
             right_df, join="outer", axis=None, fill_value=""
         )
-        diff_df = left_df.compare(right_df, keep_equal=False)
+        diff_df = _diff_aligned(left_df, right_df)
     except Exception as e:
         log = logging.getLogger(__name__)
         log.error("Error comparing tables: %s", e)
@@ -48,3 +68,20 @@ def compare_tables(
         right_df = pd.DataFrame()
         diff_df = pd.DataFrame()
     return left_df, right_df, diff_df
+
+
+def compare_tables(
+    left_tbl: Tag, right_tbl: Tag
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Return left_df, right_df, diff_df highlighting cell differences.
+    Both ``<table>`` elements are converted with ``_table_to_df`` and then
+    handed to ``compare_frames``.
+    """
+    try:
+        left_df = _table_to_df(left_tbl)
+        right_df = _table_to_df(right_tbl)
+    except Exception as e:
+        log = logging.getLogger(__name__)
+        log.error("Error comparing tables: %s", e)
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    return compare_frames(left_df, right_df)
@@ -1,17 +1,71 @@
-﻿import pathlib
+﻿import functools
+import hashlib
+import os
+import pathlib
 import re
-from typing import List, Tuple
+import tempfile
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Tuple
 
 import bs4
-import requests
+
+from .utils import SESSION, is_url
+
+# Downloaded reports are kept here so that re-runs over the same URLs only
+# need a cheap conditional GET instead of a full download.
+_CACHE_DIR = pathlib.Path("~/.cache/xts-summary").expanduser()
+
+
+def _fetch_url(url: str) -> str:
+    """Download *url*, reusing the on-disk copy while the server reports it unchanged.
+
+    The cache file's mtime mirrors the response's ``Last-Modified`` header and is
+    sent back as ``If-Modified-Since``; a ``304`` answer skips the body transfer.
+    """
+    cache_file = _CACHE_DIR / f"{hashlib.blake2b(url.encode()).hexdigest()}.html"
+    headers = {}
+    if cache_file.is_file():
+        headers["If-Modified-Since"] = formatdate(cache_file.stat().st_mtime, usegmt=True)
+    resp = SESSION.get(url, timeout=10, headers=headers)
+    if resp.status_code == 304:
+        return cache_file.read_text(encoding="utf-8")
+    resp.raise_for_status()
+    html = resp.text
+    last_modified = resp.headers.get("Last-Modified")
+    if last_modified:
+        # Without Last-Modified there is nothing to revalidate against, so don't cache.
+        _store_cache(cache_file, html, last_modified)
+    return html
+
+
+def _store_cache(cache_file: pathlib.Path, html: str, last_modified: str) -> None:
+    """Atomically write *html* to *cache_file*, dated *last_modified*.
+
+    The copy is written to a temporary file next to it and renamed into place,
+    so a concurrent reader (another thread or worker process revalidating the
+    same URL) never sees a half-written report.  Failures are ignored.
+    """
+    tmp_name = None
+    try:
+        ts = parsedate_to_datetime(last_modified).timestamp()
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.utime(tmp_name, (ts, ts))
+        os.replace(tmp_name, cache_file)
+    except (OSError, TypeError, ValueError):
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
 
 
 def _load_html(source: str) -> str:
     """Load HTML from a local file or an HTTP/HTTPS URL."""
-    if source.startswith(("http://", "https://")):
-        resp = requests.get(source, timeout=10)
-        resp.raise_for_status()
-        return resp.text
+    if is_url(source):
+        return _fetch_url(source)
     else:
         path = pathlib.Path(source).expanduser()
         return path.read_text(encoding="utf-8")
@@ -24,8 +78,31 @@ def _parse_fingerprint(soup: bs4.BeautifulSoup) -> str:
     return match.group(1) if match else "Untitled"
 
 
-def extract_testdetails(source: str) -> Tuple[str, List[bs4.Tag]]:
-    """Return (fingerprint, tables) where tables are <table class='testdetails'> elements."""
+def extract_testdetails(source: str) -> Tuple[str, Tuple[bs4.Tag, ...]]:
+    """Return (fingerprint, tables) where tables are <table class='testdetails'> elements.
+
+    Results are cached per *source* (and, for local files, per modification
+    time and size, so a rewritten file is parsed again); the returned tables
+    are shared between callers and must not be modified.
+    """
+    if is_url(source):
+        return _extract_testdetails(source, 0, 0)
+    try:
+        st = os.stat(pathlib.Path(source).expanduser())
+    except OSError:
+        # Let _load_html raise the usual error (errors are never cached)
+        return _extract_testdetails(source, 0, 0)
+    return _extract_testdetails(source, st.st_mtime_ns, st.st_size)
+
+
+# The CLI often extracts the same report twice (once while auto-selecting the
+# best candidate, again to build the report); keep the last few results around.
+# Each cached Tag keeps its whole parsed document alive, so the cache is small.
+@functools.lru_cache(maxsize=4)
+def _extract_testdetails(
+    source: str, mtime_ns: int, size: int
+) -> Tuple[str, Tuple[bs4.Tag, ...]]:
+    """Uncached body of ``extract_testdetails``; *mtime_ns*/*size* only key the cache."""
     html = _load_html(source)
     soup = bs4.BeautifulSoup(html, "lxml")
     fingerprint = _parse_fingerprint(soup)
@@ -40,5 +117,5 @@ def extract_testdetails(source: str) -> Tuple[str, List[bs4.Tag]]:
         for tbl in soup.find_all("table")
         if "incompletemodules" in (tbl.get("class") or [])
     ]
-    tables = testdetail_tables + incompletemodule_tables
+    tables = tuple(testdetail_tables + incompletemodule_tables)
     return fingerprint, tables
@@ -1,9 +1,55 @@
 """Utility functions for summary_tool package."""
 
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import __version__
+
+# Shared HTTP session.  Reports, listings and HEAD probes all go to the same
+# report server, so keeping connections alive saves a TCP (and TLS) handshake
+# on every request after the first.  Transient gateway errors are retried with
+# a short backoff; once the retries are used up the last response is returned
+# as usual, so callers still see (and handle) its status code.  Connection and
+# read errors are not retried: on a dead or slow host each of the many probes
+# would otherwise wait out the timeout several times.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = f"summary-tool/{__version__}"
+_RETRY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    raise_on_status=False,
+)
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_RETRY)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+
+
+def _reset_session() -> None:
+    """Drop the pooled connections a forked worker inherited from its parent.
+
+    Parent and child would otherwise share the same keep-alive sockets and
+    read each other's responses.  Closing only releases the child's copies
+    of the descriptors; new connections are opened on the next request.
+    """
+    SESSION.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session)
+
+# URL schemes the tool fetches over HTTP; anything else is a local path
+URL_SCHEMES = ("http://", "https://")
+
 
 def is_url(s: str) -> bool:
     """Return True if *s* looks like an HTTP/HTTPS URL.
 
     Simple check based on the scheme prefix.
     """
-    return s.startswith(("http://", "https://"))
+    return s.startswith(URL_SCHEMES)
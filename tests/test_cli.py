@@ -0,0 +1,25 @@
+from summary_tool import cli
+
+REPORT = """<html><body>
+<table class="testdetails">
+<tr><td class="module" colspan="3">arm64-v8a CtsFooTestCases</td></tr>
+<tr><th>Test</th><th>Result</th><th>Details</th></tr>
+<tr><td class="testname">android.foo.T#test1</td><td class="failed">fail</td><td>boom</td></tr>
+</table>
+</body></html>"""
+
+
+def test_select_best_skips_unreadable_candidate(tmp_path):
+    good = tmp_path / "good" / "test_result_failures_suite.html"
+    good.parent.mkdir()
+    good.write_text(REPORT, encoding="utf-8")
+    missing = tmp_path / "missing" / "test_result_failures_suite.html"
+
+    # The unreadable candidate would rank as the oldest one; it must not win.
+    assert cli._select_best([str(good), str(missing)]) == str(good)
+    assert cli._select_best([str(missing), str(good)]) == str(good)
+
+
+def test_select_best_falls_back_to_first_when_all_fail(tmp_path):
+    paths = [str(tmp_path / "a.html"), str(tmp_path / "b.html")]
+    assert cli._select_best(paths) == paths[0]
@@ -0,0 +1,64 @@
+from summary_tool.comparer import _table_to_df, compare_frames
+from summary_tool.extractor import extract_testdetails
+from summary_tool.html_report import generate_report
+
+MODULE = 'Cts<Foo>&"Bar"'
+TITLE = 'fp<b>&"x"'
+
+REPORT = """<html><body>
+<table class="summary">
+<tr><th colspan="2">Summary</th></tr>
+<tr><td class="rowtitle">Suite / Plan</td><td>CTS&lt;x&gt; / cts</td></tr>
+<tr><td class="rowtitle">Modules Total</td><td>2</td></tr>
+</table>
+<table class="incompletemodules"><tr><th>Incomplete Modules</th></tr>
+<tr><td>armeabi-v7a {module}</td></tr>
+</table>
+<table class="testdetails">
+<tr><td class="module" colspan="3">arm64-v8a {module}</td></tr>
+<tr><th>Test</th><th>Result</th><th>Details</th></tr>
+<tr><td class="testname">android.foo.T#test1</td><td class="failed">fail</td><td>boom</td></tr>
+</table>
+</body></html>"""
+
+
+def _write_report(path):
+    escaped = MODULE.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    path.write_text(REPORT.format(module=escaped), encoding="utf-8")
+    _, tables = extract_testdetails(str(path))
+    return [_table_to_df(t) for t in tables]
+
+
+def _assert_escaped(page):
+    assert MODULE not in page
+    assert TITLE not in page
+    assert "CTS<x>" not in page
+    assert "Cts&lt;Foo&gt;&amp;" in page
+    assert "<h2>fp&lt;b&gt;&amp;" in page
+    assert "CTS&lt;x&gt;" in page
+
+
+def test_single_column_escapes_names_and_titles(tmp_path):
+    src = tmp_path / "we'ird&dir" / "test_result_failures_suite.html"
+    src.parent.mkdir()
+    dfs = _write_report(src)
+    out = generate_report(
+        dfs, [], [], TITLE, "", tmp_path / "single.html", str(src), None,
+        has_testdetails=True, chart_index=0,
+    )
+    page = out.read_text(encoding="utf-8")
+    _assert_escaped(page)
+    assert "href='" + str(src.parent).replace("&", "&amp;").replace("'", "&#x27;") in page
+
+
+def test_double_column_escapes_names_and_titles(tmp_path):
+    left = tmp_path / "left.html"
+    right = tmp_path / "right.html"
+    left_dfs = _write_report(left)
+    right_dfs = _write_report(right)
+    diffs = [compare_frames(a, b) for a, b in zip(left_dfs, right_dfs)]
+    out = generate_report(
+        left_dfs, right_dfs, diffs, TITLE, TITLE, tmp_path / "double.html",
+        str(left), str(right), has_testdetails=True, chart_index=0,
+    )
+    _assert_escaped(out.read_text(encoding="utf-8"))